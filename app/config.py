@@ -23,6 +23,8 @@ AMFI_NAV_HISTORY_URL = "https://www.amfiindia.com/api/nav-history"
 
 # Settings
 YEARS_BACK = 10
+MAX_WORKERS = int(os.getenv('MAX_WORKERS', '16'))  # Thread pool size for per-scheme work
+HISTORICAL_SYNC_CHUNK_FILES = 100  # NAV files loaded and upserted together during historical sync
 
 # Database
 DB_URL = os.getenv('DB_URL')
@@ -1,8 +1,10 @@
 import pandas as pd
 import os
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from app.utils.legacy import import_returns_data, import_nav_data_upsert, get_existing_isins
+from app.utils.legacy import import_returns_data, import_nav_data_upsert, import_nav_data_copy, get_existing_isins
 from app.database.setup import create_app, db
 from app import config
 from app.utils.storage import storage
@@ -10,6 +12,41 @@ from app.utils.storage import storage
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Historical NAV CSVs are written by NavManager as Date (YYYY-MM-DD), NAV.
+# Fixing the columns and types up front skips pandas' per-column type inference.
+NAV_CSV_OPTIONS = dict(
+    usecols=['Date', 'NAV'],
+    dtype={'NAV': 'float64'},
+    parse_dates=['Date'],
+    date_format='%Y-%m-%d'
+)
+
+# Map column names from our generated report to expected format
+RETURNS_COLUMN_MAPPING = {
+    '1M_Abs': '1M Return',
+    '3M_Abs': '3M Return',
+    '6M_Abs': '6M Return',
+    'YTD_Abs': 'YTD Return',
+    '1Y_Abs': '1Y Return',
+    '3Y_Abs': '3Y Return',
+    '5Y_Abs': '5Y Return',
+    '3Y_CAGR': '3Y CAGR',
+    '5Y_CAGR': '5Y CAGR',
+    '10Y_CAGR': '10Y CAGR',
+    'Inception_Abs': 'Inception Return',
+    'Inception_CAGR': 'Inception CAGR'
+}
+
+# Only ISIN, latest NAV and the return columns are synced from the returns report.
+# usecols is a callable so older reports missing some return columns still load.
+RETURNS_REPORT_COLUMNS = {'ISIN', 'Date', 'NAV', *RETURNS_COLUMN_MAPPING}
+RETURNS_CSV_OPTIONS = dict(
+    usecols=lambda column: column in RETURNS_REPORT_COLUMNS,
+    dtype={'ISIN': str, 'NAV': 'float64', **{column: 'float64' for column in RETURNS_COLUMN_MAPPING}},
+    parse_dates=['Date'],
+    date_format='%Y-%m-%d'
+)
+
 def sync_daily_data(clear_existing=False):
     """
     Quick daily sync: Uploads current NAV and returns data from the returns report.
@@ -36,12 +73,11 @@ def sync_daily_data(clear_existing=False):
             return
         
         try:
-            returns_df = storage.read_csv(returns_report_path)
+            returns_df = storage.read_csv(returns_report_path, **RETURNS_CSV_OPTIONS)
             
             # 1. Extract and sync latest NAV data
             logger.info("Syncing latest NAV data from returns report...")
-            nav_df = returns_df[['ISIN', 'Date', 'NAV']].copy()
-            nav_df = nav_df.dropna(subset=['ISIN', 'Date', 'NAV'])
+            nav_df = returns_df[['ISIN', 'Date', 'NAV']].dropna()
             
             if len(nav_df) > 0:
                 nav_stats = import_nav_data_upsert(
@@ -56,26 +92,10 @@ def sync_daily_data(clear_existing=False):
             # 2. Sync returns data
             logger.info("Syncing returns data...")
             
-            # Map column names from our generated report to expected format
-            column_mapping = {
-                '1M_Abs': '1M Return',
-                '3M_Abs': '3M Return',
-                '6M_Abs': '6M Return',
-                'YTD_Abs': 'YTD Return',
-                '1Y_Abs': '1Y Return',
-                '3Y_Abs': '3Y Return',
-                '5Y_Abs': '5Y Return',
-                '3Y_CAGR': '3Y CAGR',
-                '5Y_CAGR': '5Y CAGR',
-                '10Y_CAGR': '10Y CAGR',
-                'Inception_Abs': 'Inception Return',
-                'Inception_CAGR': 'Inception CAGR'
-            }
-            
-            returns_data = returns_df.rename(columns=column_mapping)
+            returns_df.rename(columns=RETURNS_COLUMN_MAPPING, inplace=True)
             
             returns_stats = import_returns_data(
-                returns_data,
+                returns_df,
                 existing_isins=existing_isins,
                 clear_existing=False  # Never clear for daily sync
             )
@@ -89,6 +109,35 @@ def sync_daily_data(clear_existing=False):
         logger.info("DAILY SYNC COMPLETE")
         logger.info("=" * 60)
 
+def _nav_load_processes():
+    """
+    Size of the historical NAV read pool: the CPUs this process may run on, capped at MAX_WORKERS.
+    Each worker is a fresh interpreter, so the pool is kept small.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS/Windows
+        cpus = os.cpu_count() or 1
+    return min(config.MAX_WORKERS, cpus)
+
+def _load_nav_file(nav_file):
+    """
+    Loads a single historical NAV CSV and tags it with its ISIN.
+    Runs in a worker process. Returns None if the file is unreadable.
+    
+    Args:
+        nav_file: (isin, nav_filepath) tuple
+    """
+    isin, nav_filepath = nav_file
+    
+    try:
+        nav_df = storage.read_csv(nav_filepath, **NAV_CSV_OPTIONS).assign(ISIN=isin)  # Add ISIN column
+        logger.debug(f"Loaded {len(nav_df)} NAV records for {isin}")
+        return nav_df
+    except Exception as e:
+        logger.error(f"Error reading NAV file {nav_filepath}: {e}")
+        return None
+
 def sync_historical_nav(isin_master_list_path=None, clear_existing=False):
     """
     Historical sync: Uploads all historical NAV data from CSV files.
@@ -119,43 +168,60 @@ def sync_historical_nav(isin_master_list_path=None, clear_existing=False):
             logger.error(f"Failed to read master list: {e}")
             return
         
-        # Collect all NAV data from CSV files
-        all_nav_data = []
-        for index, row in master_df.iterrows():
-            isin = row.get('ISIN')
-            scheme_code = row.get('Scheme Code')
-            
-            if pd.isna(scheme_code) or pd.isna(isin):
-                continue
-            
-            nav_filepath = os.path.join(config.HISTORICAL_NAV_DIR, f"{int(float(scheme_code))}.csv")
-            if config.USE_GCS:
-                nav_filepath = nav_filepath.replace("\\", "/") # Ensure forward slashes for GCS
-
-            if not storage.exists(nav_filepath):
-                logger.warning(f"NAV file not found: {nav_filepath}")
-                continue
-            
-            try:
-                nav_df = storage.read_csv(nav_filepath) 
-                nav_df['ISIN'] = isin  # Add ISIN column
-                all_nav_data.append(nav_df)
-                logger.info(f"Loaded {len(nav_df)} NAV records for {isin}")
-            except Exception as e:
-                logger.error(f"Error reading NAV file {nav_filepath}: {e}")
+        # Only rows with both an ISIN and a Scheme Code have a NAV file to load
+        master_df = master_df.dropna(subset=['ISIN', 'Scheme Code'])
         
-        if all_nav_data:
-            # Combine all NAV data
-            combined_nav_df = pd.concat(all_nav_data, ignore_index=True)
-            logger.info(f"Total NAV records to sync: {len(combined_nav_df)}")
-            
-            # Use legacy function to import
-            nav_stats = import_nav_data_upsert(
-                combined_nav_df, 
-                clear_existing=clear_existing,
-                existing_isins=existing_isins
-            )
-            logger.info(f"NAV sync completed: {nav_stats}")
+        # Rows for funds missing from the DB would be dropped on import, so don't read their files
+        in_db_mask = master_df['ISIN'].astype(str).str.strip().isin(existing_isins)
+        if not in_db_mask.all():
+            logger.warning(f"Skipping {(~in_db_mask).sum()} master list ISINs not found in database")
+            master_df = master_df[in_db_mask]
+        
+        # Build all NAV file paths at once: <HISTORICAL_NAV_DIR>/<scheme code>.csv
+        sep = "/" if config.USE_GCS else os.sep  # Ensure forward slashes for GCS
+        scheme_codes = master_df['Scheme Code'].astype(float).astype('int64').astype(str)
+        nav_filepaths = config.HISTORICAL_NAV_DIR + sep + scheme_codes + ".csv"
+        
+        # One listing of the NAV directory (or bucket prefix) instead of an exists() call per file
+        available_files = set(storage.list_files(config.HISTORICAL_NAV_DIR))
+        found_mask = nav_filepaths.isin(available_files)
+        for nav_filepath in nav_filepaths[~found_mask]:
+            logger.warning(f"NAV file not found: {nav_filepath}")
+        nav_files = list(zip(master_df['ISIN'][found_mask], nav_filepaths[found_mask]))
+        
+        # Load and sync NAV data a chunk of files at a time so only one chunk is held in memory.
+        # Files are read in parallel. Workers are spawned, not forked, so they don't inherit
+        # this process's DB connection or GCS client.
+        chunk_files = config.HISTORICAL_SYNC_CHUNK_FILES
+        total_records = 0
+        total_funds = 0
+        
+        # A full refresh loads everything with COPY; otherwise upsert row batches
+        import_nav_data = import_nav_data_copy if clear_existing else import_nav_data_upsert
+        with ProcessPoolExecutor(max_workers=_nav_load_processes(), mp_context=multiprocessing.get_context('spawn')) as executor:
+            for start in range(0, len(nav_files), chunk_files):
+                results = executor.map(_load_nav_file, nav_files[start:start + chunk_files], chunksize=4)
+                chunk_nav_data = [nav_df for nav_df in results if nav_df is not None]
+                if not chunk_nav_data:
+                    continue
+                
+                chunk_funds = len(chunk_nav_data)
+                chunk_nav_df = pd.concat(chunk_nav_data, ignore_index=True)
+                del chunk_nav_data
+                logger.info(f"Syncing {len(chunk_nav_df)} NAV records from files {start + 1}-{min(start + chunk_files, len(nav_files))} of {len(nav_files)}")
+                
+                # Use legacy function to import. Only the first chunk may clear existing data.
+                nav_stats = import_nav_data(
+                    chunk_nav_df, 
+                    clear_existing=clear_existing and total_records == 0,
+                    existing_isins=existing_isins
+                )
+                logger.info(f"NAV sync completed: {nav_stats}")
+                total_records += len(chunk_nav_df)
+                total_funds += chunk_funds
+        
+        if total_records:
+            logger.info(f"Loaded and synced {total_records} NAV records across {total_funds} funds")
         else:
             logger.warning("No NAV data found to sync")
         
@@ -41,10 +41,7 @@ def main(master_list_path=None):
 
     # 2. Update Historical Data
     print("Updating historical data...")
-    for index, row in df.iterrows():
-        scheme_code = str(row['Scheme Code'])
-        scheme_name = row['Scheme Name']
-        
+    for scheme_code, scheme_name in zip(df['Scheme Code'].astype(str), df['Scheme Name']):
         if pd.isna(scheme_code) or scheme_code == 'nan':
             logging.warning(f"Skipping {scheme_name} (No Scheme Code)")
             continue
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
 from app import config
 from app.utils.storage import storage
 
@@ -8,14 +9,17 @@ class ReturnCalculator:
     def __init__(self):
         pass
 
-    def calculate_returns(self, df):
+    def calculate_returns(self, df, report=None):
         """
         Calculates returns for various periods.
         df must have 'Date' and 'NAV' columns and be sorted by Date.
+        The period table is printed, or appended line by line to report if a list is given.
         """
         if df.empty:
             return {}
 
+        emit = print if report is None else report.append
+
         # Ensure datetime
         df['Date'] = pd.to_datetime(df['Date'])
         df = df.sort_values('Date')
@@ -23,8 +27,8 @@ class ReturnCalculator:
         latest_date = df['Date'].iloc[-1]
         latest_nav = df['NAV'].iloc[-1]
         
-        print(f"Latest Date: {latest_date.date()}")
-        print(f"Latest NAV: {latest_nav}")
+        emit(f"Latest Date: {latest_date.date()}")
+        emit(f"Latest NAV: {latest_nav}")
 
         from dateutil.relativedelta import relativedelta
         
@@ -46,92 +50,114 @@ class ReturnCalculator:
             'Date': latest_date.date(),
             'NAV': latest_nav
         }
-        
-        print(f"{'Period':<10} | {'Target Date':<12} | {'Actual Date':<12} | {'Past NAV':<10} | {'Abs Return':<10} | {'CAGR':<10}")
-        print("-" * 80)
 
+        target_dates = {}
         for period_name, delta in periods.items():
             if period_name == 'YTD':
                 start_of_year = pd.Timestamp(year=latest_date.year, month=1, day=1)
-                target_date = start_of_year - timedelta(days=1) # Last day of previous year
+                target_dates[period_name] = start_of_year - timedelta(days=1) # Last day of previous year
             elif period_name == 'Inception':
-                target_date = df['Date'].iloc[0]
+                target_dates[period_name] = df['Date'].iloc[0]
             else:
-                target_date = latest_date - delta
-            
-            # Find closest date <= target_date
-            # We look for the price on or before the target date
-            past_data = df[df['Date'] <= target_date]
-            
-            if past_data.empty:
+                target_dates[period_name] = latest_date - delta
+
+        # Find closest date <= target_date for all periods in one pass
+        # We look for the price on or before the target date
+        targets = pd.DataFrame({'Period': list(target_dates), 'Target Date': list(target_dates.values())})
+        targets['Target Date'] = targets['Target Date'].astype(df['Date'].dtype)
+        matched = pd.merge_asof(
+            targets.sort_values('Target Date'),
+            df[['Date', 'NAV']],
+            left_on='Target Date',
+            right_on='Date',
+            direction='backward'
+        ).set_index('Period').reindex(list(periods))
+
+        # Calculate Absolute Return
+        matched['Abs'] = (latest_nav / matched['NAV']) - 1
+
+        # Calculate years difference for CAGR
+        years = (latest_date - matched['Date']).dt.days / 365.25
+        growth = (latest_nav / matched['NAV']) ** (1 / years) - 1
+
+        # CAGR for periods of 1Y and above, using the actual time difference for the exponent to be precise.
+        # Inception falls back to the absolute return when the history is shorter than a year.
+        long_periods = [name for name, delta in periods.items() if isinstance(delta, relativedelta) and delta.years >= 1]
+        is_inception = matched.index == 'Inception'
+        matched['CAGR'] = np.select(
+            [matched.index.isin(long_periods), is_inception & (years > 1), is_inception],
+            [growth, growth, matched['Abs']],
+            default=np.nan
+        )
+
+        emit(f"{'Period':<10} | {'Target Date':<12} | {'Actual Date':<12} | {'Past NAV':<10} | {'Abs Return':<10} | {'CAGR':<10}")
+        emit("-" * 80)
+
+        # to_dict keeps each column's dtype; iterrows would coerce an all-NaN float row to NaT
+        for period_name, row in matched.to_dict('index').items():
+            if pd.isna(row['Date']):
                 results[f'{period_name}_Abs'] = np.nan
                 results[f'{period_name}_CAGR'] = np.nan
                 continue
-                
-            past_date = past_data['Date'].iloc[-1]
-            past_nav = past_data['NAV'].iloc[-1]
-            
-            # Calculate Absolute Return
-            abs_return = (latest_nav / past_nav) - 1
-            
-            # Calculate CAGR for periods > 1Y
-            cagr = np.nan
-            
-            # Calculate years difference for CAGR
-            days_diff = (latest_date - past_date).days
-            years = days_diff / 365.25
-            
-            if period_name == 'Inception':
-                if years > 1:
-                    cagr = (latest_nav / past_nav) ** (1 / years) - 1
-                else:
-                    cagr = abs_return
-            elif hasattr(delta, 'years') and delta.years >= 1:
-                # Use the actual time difference for the exponent to be precise
-                cagr = (latest_nav / past_nav) ** (1 / years) - 1
-            elif isinstance(delta, relativedelta) and (delta.years > 0 or (delta.months or 0) >= 12):
-                 if years >= 1:
-                    cagr = (latest_nav / past_nav) ** (1 / years) - 1
+
+            abs_return = row['Abs']
+            cagr = row['CAGR']
 
             results[f'{period_name}_Abs'] = abs_return
-            if not np.isnan(cagr):
+            if not pd.isna(cagr):
                 results[f'{period_name}_CAGR'] = cagr
             
-            cagr_str = f"{cagr:.4%}" if not np.isnan(cagr) else ""
-            t_date_str = str(target_date.date()) if hasattr(target_date, 'date') else str(target_date)
-            p_date_str = str(past_date.date())
+            cagr_str = f"{cagr:.4%}" if not pd.isna(cagr) else ""
+            t_date_str = str(row['Target Date'].date())
+            p_date_str = str(row['Date'].date())
             
-            print(f"{period_name:<10} | {t_date_str:<12} | {p_date_str:<12} | {past_nav:<10.4f} | {abs_return:<10.4%} | {cagr_str:<10}")
+            emit(f"{period_name:<10} | {t_date_str:<12} | {p_date_str:<12} | {row['NAV']:<10.4f} | {abs_return:<10.4%} | {cagr_str:<10}")
 
         return results
 
+    def _compute_scheme_returns(self, row, nav_folder):
+        """
+        Computes returns for a single master list row.
+        Returns (returns, report): returns is None if skipped or failed, report holds the lines to print.
+        """
+        report = []
+        scheme_code = row.get('Scheme Code')
+        scheme_name = row.get('Scheme Name')
+        isin = row.get('ISIN')
+        
+        if pd.isna(scheme_code) or scheme_code == '':
+            return None, report
+            
+        filepath = f"{nav_folder}/{str(int(float(scheme_code)))}.csv"
+        try:
+            # Use storage abstraction to read from GCS or local
+            nav_df = storage.read_csv(filepath)
+            returns = self.calculate_returns(nav_df, report)
+            
+            # Add metadata
+            returns['ISIN'] = isin
+            returns['Scheme Name'] = scheme_name
+            returns['Scheme Code'] = scheme_code
+            
+            return returns, report
+        except Exception as e:
+            report.append(f"Error calculating returns for {scheme_name}: {e}")
+            return None, report
+
     def compute_all_returns(self, master_df, nav_folder):
         """
         Computes returns for all schemes in the master list.
+        Schemes are read and computed concurrently; reports are printed and results
+        collected here in master list order so output from different schemes never interleaves.
         """
+        rows = master_df.to_dict('records')
         all_results = []
         
-        for index, row in master_df.iterrows():
-            scheme_code = row.get('Scheme Code')
-            scheme_name = row.get('Scheme Name')
-            isin = row.get('ISIN')
-            
-            if pd.isna(scheme_code) or scheme_code == '':
-                continue
-                
-            filepath = f"{nav_folder}/{str(int(float(scheme_code)))}.csv"
-            try:
-                # Use storage abstraction to read from GCS or local
-                nav_df = storage.read_csv(filepath)
-                returns = self.calculate_returns(nav_df)
-                
-                # Add metadata
-                returns['ISIN'] = isin
-                returns['Scheme Name'] = scheme_name
-                returns['Scheme Code'] = scheme_code
-                
-                all_results.append(returns)
-            except Exception as e:
-                print(f"Error calculating returns for {scheme_name}: {e}")
+        with ThreadPoolExecutor(max_workers=config.MAX_WORKERS) as executor:
+            for returns, report in executor.map(lambda row: self._compute_scheme_returns(row, nav_folder), rows):
+                if report:
+                    print("\n".join(report))
+                if returns is not None:
+                    all_results.append(returns)
                 
         return pd.DataFrame(all_results)
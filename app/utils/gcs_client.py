@@ -0,0 +1,22 @@
+from functools import lru_cache
+from app import config
+
+# HTTP connection pool for the shared client. Must cover the threads that use it
+# concurrently (config.MAX_WORKERS), otherwise connections are dropped and re-opened.
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+
+@lru_cache(maxsize=1)
+def get_client():
+    """Returns the process-wide GCS client, created on first use."""
+    from google.cloud import storage
+    from requests.adapters import HTTPAdapter
+
+    client = storage.Client()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=max(POOL_MAXSIZE, config.MAX_WORKERS))
+    client._http.mount("https://", adapter)
+    return client
+
+def get_bucket(bucket_name=None):
+    """Returns a handle to the given bucket (defaults to config.GCS_BUCKET_NAME) on the shared client."""
+    return get_client().bucket(bucket_name or config.GCS_BUCKET_NAME)
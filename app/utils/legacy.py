@@ -2,6 +2,7 @@ import pandas as pd
 import os
 import logging
 import sys
+from io import StringIO
 from datetime import datetime
 from sqlalchemy import text
 from app import config
@@ -16,13 +17,13 @@ logger = logging.getLogger(__name__)
 
 
 def get_existing_isins():
-    """Fetches all valid ISINs from the mf_fund table."""
+    """Fetches all valid ISINs from the mf_fund table as a frozenset."""
     try:
         result = db.session.execute(text("SELECT isin FROM mf_fund"))
-        return {row[0] for row in result}
+        return frozenset(row[0] for row in result)
     except Exception as e:
         logger.error(f"Error fetching ISINs from mf_fund: {e}")
-        return set()
+        return frozenset()
 
 
 def import_returns_data(df, existing_isins=None ,clear_existing=False):
@@ -181,7 +182,32 @@ def import_returns_data(df, existing_isins=None ,clear_existing=False):
             logger.error(f"Error importing returns data: {e}")
             raise
 
-def import_nav_data_upsert(df, clear_existing=False, existing_isins=None, batch_size=10000):
+def prepare_nav_data(df, existing_isins):
+        """
+        Clean NAV data from DataFrame into mf_nav_history columns
+        
+        Args:
+            df: DataFrame containing NAV data (ISIN, Date, NAV)
+            existing_isins (set): Set of ISINs that exist in the database for validation
+            
+        Returns:
+            tuple: (DataFrame with isin, date and nav columns, number of rows skipped for missing funds)
+        """
+        isins = df['ISIN'].astype(str).str.strip()
+        valid_mask = isins.isin(existing_isins)
+
+        nav_df = pd.DataFrame({
+            'isin': isins,
+            'date': pd.to_datetime(df['Date'], errors='coerce').dt.date,
+            'nav': pd.to_numeric(df['NAV'], errors='coerce')
+        })[valid_mask].dropna()
+
+        # A row may only be upserted once per statement
+        nav_df = nav_df.drop_duplicates(subset=['isin', 'date'], keep='last')
+
+        return nav_df, int((~valid_mask).sum())
+
+def import_nav_data_upsert(df, clear_existing=False, existing_isins=None, batch_size=5000):
         """
         Import NAV data from DataFrame using bulk upsert strategy
         
@@ -203,76 +229,40 @@ def import_nav_data_upsert(df, clear_existing=False, existing_isins=None, batch_
                 db.session.commit()
                 logger.info("Cleared existing NAV data")
 
+            # Clean data
+            nav_df, missing_funds = prepare_nav_data(df, existing_isins)
+
             # Track statistics
             stats = {
                 'nav_records_upserted': 0,
                 'total_rows_processed': len(df),
                 'batch_size_used': batch_size,
-                'missing_funds_skipped': 0
+                'missing_funds_skipped': missing_funds
 
             }
 
-            batch_count = 0
+            # Build the upsert once; each batch executes it with a list of
+            # parameter sets (executemany) instead of a new multi-row statement
+            from sqlalchemy.dialects.postgresql import insert
+
+            stmt = insert(NavHistory.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['isin', 'date'],
+                set_=dict(nav=stmt.excluded.nav)
+            )
 
             # Process data in batches
-            total_batches = (len(df) + batch_size - 1) // batch_size
+            total_batches = (len(nav_df) + batch_size - 1) // batch_size
             
             for batch_num in range(total_batches):
                 start_idx = batch_num * batch_size
-                end_idx = min(start_idx + batch_size, len(df))
-                batch_df = df.iloc[start_idx:end_idx]
+                end_idx = min(start_idx + batch_size, len(nav_df))
+                nav_records = nav_df.iloc[start_idx:end_idx].to_dict('records')
                 
                 logger.info(f"Processing NAV batch {batch_num + 1}/{total_batches} (rows {start_idx + 1}-{end_idx})")
                 
-                nav_records = []
-                
-                for _, row in batch_df.iterrows():
-                    try:
-                        isin = str(row.get('ISIN', '')).strip()
-                        if not isin or isin.lower() == 'nan' or len(isin) < 8:
-                            continue
-
-                        if isin not in existing_isins:
-                          stats['missing_funds_skipped'] += 1
-                          continue
-
-                        # Parse date
-                        date_str = str(row.get('Date', ''))
-                        if pd.notna(row.get('Date')):
-                            if isinstance(row.get('Date'), datetime):
-                                nav_date = row.get('Date').date()
-                            else:
-                                nav_date = pd.to_datetime(date_str).date()
-                        else:
-                            continue
-
-                        nav_value = float(row.get('NAV', 0)) if pd.notna(
-                            row.get('NAV')) else None
-                        if nav_value is None:
-                            continue
-
-                        nav_record = {
-                            'isin': isin,
-                            'date': nav_date,
-                            'nav': nav_value
-                        }
-                        nav_records.append(nav_record)
-
-                    except Exception as e:
-                        logger.error(f"Error processing NAV row: {e}")
-                        continue
-                
-                # Bulk upsert NAV records using PostgreSQL
-                if nav_records:
-                    from sqlalchemy.dialects.postgresql import insert
-                    
-                    stmt = insert(NavHistory.__table__).values(nav_records)
-                    stmt = stmt.on_conflict_do_update(
-                        index_elements=['isin', 'date'],
-                        set_=dict(nav=stmt.excluded.nav)
-                    )
-                    db.session.execute(stmt)
-                    stats['nav_records_upserted'] += len(nav_records)
+                db.session.execute(stmt, nav_records)
+                stats['nav_records_upserted'] += len(nav_records)
                     
                 # Commit batch
                 db.session.commit()
@@ -284,4 +274,86 @@ def import_nav_data_upsert(df, clear_existing=False, existing_isins=None, batch_
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error importing NAV data: {e}")
-            raise
\ No newline at end of file
+            raise
+
+def import_nav_data_copy(df, clear_existing=False, existing_isins=None, batch_size=50000):
+        """
+        Import NAV data from DataFrame using PostgreSQL COPY.
+        Each batch is streamed into a temporary staging table and merged into
+        mf_nav_history with a single INSERT ... ON CONFLICT, so this is much faster
+        than import_nav_data_upsert for large historical loads.
+        
+        Args:
+            df: DataFrame containing NAV data (ISIN, Date, NAV)
+            clear_existing (bool): Whether to clear existing data before import
+            existing_isins (set): Set of ISINs that exist in the database for validation
+            batch_size (int): Number of records to copy and commit in each batch
+            
+        Returns:
+            dict: Statistics about the import operation
+        """
+        logger.info(f"Importing NAV data with {len(df)} records using COPY")
+
+        try:
+            if clear_existing and len(df) > 0:
+                # Clear all existing NAV data
+                NavHistory.query.delete()
+                db.session.commit()
+                logger.info("Cleared existing NAV data")
+
+            # Clean data
+            nav_df, missing_funds = prepare_nav_data(df, existing_isins)
+
+            now = datetime.utcnow()
+            nav_df['created_at'] = now
+            nav_df['updated_at'] = now
+
+            # Track statistics
+            stats = {
+                'nav_records_copied': 0,
+                'total_rows_processed': len(df),
+                'batch_size_used': batch_size,
+                'missing_funds_skipped': missing_funds
+            }
+
+            # Process data in batches, each in its own transaction to keep lock time short
+            total_batches = (len(nav_df) + batch_size - 1) // batch_size
+
+            for batch_num in range(total_batches):
+                start_idx = batch_num * batch_size
+                end_idx = min(start_idx + batch_size, len(nav_df))
+
+                logger.info(f"Copying NAV batch {batch_num + 1}/{total_batches} (rows {start_idx + 1}-{end_idx})")
+
+                buffer = StringIO()
+                nav_df.iloc[start_idx:end_idx].to_csv(buffer, index=False, header=False)
+                buffer.seek(0)
+
+                db.session.execute(text(
+                    "CREATE TEMP TABLE tmp_nav_history "
+                    "(isin VARCHAR(12), date DATE, nav DOUBLE PRECISION, created_at TIMESTAMP, updated_at TIMESTAMP) "
+                    "ON COMMIT DROP"))
+
+                # COPY goes through the raw psycopg2 cursor on the session's connection
+                cursor = db.session.connection().connection.cursor()
+                cursor.copy_expert(
+                    "COPY tmp_nav_history (isin, date, nav, created_at, updated_at) FROM STDIN WITH CSV",
+                    buffer)
+
+                db.session.execute(text(
+                    "INSERT INTO mf_nav_history (isin, date, nav, created_at, updated_at) "
+                    "SELECT isin, date, nav, created_at, updated_at FROM tmp_nav_history "
+                    "ON CONFLICT (isin, date) DO UPDATE SET nav = EXCLUDED.nav"))
+                stats['nav_records_copied'] += end_idx - start_idx
+
+                # Commit batch (drops the staging table)
+                db.session.commit()
+
+            logger.info(f"NAV import completed (copied): {stats}")
+
+            return stats
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error importing NAV data: {e}")
+            raise
@@ -2,14 +2,14 @@ import os
 import pandas as pd
 from io import StringIO, BytesIO
 from app import config
+from app.utils.gcs_client import get_client, get_bucket
 
 class StorageManager:
     def __init__(self):
         self.use_gcs = config.USE_GCS
         if self.use_gcs:
-            from google.cloud import storage
-            self.client = storage.Client()
-            self.bucket = self.client.bucket(config.GCS_BUCKET_NAME)
+            self.client = get_client()
+            self.bucket = get_bucket(config.GCS_BUCKET_NAME)
 
     def exists(self, path):
         if self.use_gcs:
@@ -18,13 +18,13 @@ class StorageManager:
         else:
             return os.path.exists(path)
 
-    def read_csv(self, path):
+    def read_csv(self, path, **kwargs):
         if self.use_gcs:
             blob = self.bucket.blob(path)
             content = blob.download_as_string()
-            return pd.read_csv(BytesIO(content))
+            return pd.read_csv(BytesIO(content), **kwargs)
         else:
-            return pd.read_csv(path)
+            return pd.read_csv(path, **kwargs)
 
     def write_csv(self, df, path):
         if self.use_gcs:
@@ -53,7 +53,8 @@ class StorageManager:
 
     def list_files(self, prefix):
         if self.use_gcs:
-            blobs = self.bucket.list_blobs(prefix=prefix)
+            # Only names are used; skip the rest of each object's metadata
+            blobs = self.bucket.list_blobs(prefix=prefix, fields='items(name),nextPageToken')
             return [blob.name for blob in blobs]
         else:
             files = []
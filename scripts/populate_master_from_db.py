@@ -1,6 +1,11 @@
 import sys
 import os
+import csv
+import shutil
+import subprocess
 import logging
+from io import BytesIO
+import numpy as np
 import pandas as pd
 from sqlalchemy import text
 
@@ -17,6 +22,41 @@ from app import config
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Format: Scheme Code;ISIN Div Payout/Growth;ISIN Div Reinv;Scheme Name;NAV;Date
+# Section headers and AMC names have no ';' and come through with empty ISIN columns
+NAV_ALL_COLUMNS = ['Scheme Code', 'ISIN Payout', 'ISIN Reinv', 'Scheme Name', 'NAV', 'Date']
+NAV_ALL_CSV_OPTIONS = dict(
+    sep=';',
+    header=None,
+    names=NAV_ALL_COLUMNS,
+    usecols=[0, 1, 2, 3],
+    dtype=str,
+    quoting=csv.QUOTE_NONE,
+    on_bad_lines='skip'
+)
+
+def read_nav_all(isins):
+    """
+    Reads the scheme code, ISIN and scheme name columns of NAVAll.txt.
+    For local files the lines are first narrowed down with a fixed-string grep
+    on the given ISINs, so only candidate lines reach the CSV parser.
+    Falls back to parsing the whole file on GCS or when grep is unavailable.
+    """
+    if not config.USE_GCS and shutil.which('grep'):
+        result = subprocess.run(
+            ['grep', '-F', '-f', '-', config.NAV_ALL_FILE],
+            input="\n".join(isins).encode(),
+            capture_output=True
+        )
+        # grep exits with 1 when nothing matched and 2 on error
+        if result.returncode in (0, 1):
+            if not result.stdout:
+                return pd.DataFrame(columns=NAV_ALL_COLUMNS[:4], dtype=str)
+            return pd.read_csv(BytesIO(result.stdout), **NAV_ALL_CSV_OPTIONS)
+        logger.warning(f"grep pre-filter failed, parsing full NAVAll.txt: {result.stderr.decode().strip()}")
+    
+    return storage.read_csv(config.NAV_ALL_FILE, **NAV_ALL_CSV_OPTIONS)
+
 def populate_master_from_db():
     """
     Populates data/isin_master_list.csv based on funds currently in the database.
@@ -52,48 +92,22 @@ def populate_master_from_db():
             return False
 
     logger.info("Reading NAVAll.txt for metadata lookup...")
-    matched_data = []
     
     try:
-        content = storage.read_text(config.NAV_ALL_FILE)
-            
-        for line in content.splitlines():
-            line = line.strip()
-            if not line or ";" not in line:
-                continue
-            
-            # Format: Scheme Code;ISIN Div Payout/Growth;ISIN Div Reinv;Scheme Name;NAV;Date
-            parts = line.split(';')
-            if len(parts) >= 6:
-                scheme_code = parts[0]
-                isin_payout = parts[1]
-                isin_reinv = parts[2]
-                scheme_name = parts[3]
-                
-                # Check if this record matches any ISIN in our DB
-                matched_isin = None
-                
-                if isin_payout in db_isins:
-                    matched_isin = isin_payout
-                elif isin_reinv in db_isins:
-                    matched_isin = isin_reinv
-                
-                if matched_isin:
-                    matched_data.append({
-                        'ISIN': matched_isin,
-                        'Scheme Code': scheme_code,
-                        'Scheme Name': scheme_name
-                    })
-                    # Remove from set to track what we found (optional, but good for reporting missing)
-                    # db_isins.discard(matched_isin) # Don't discard if we want to allow duplicates or just track
+        nav_all_df = read_nav_all(db_isins)
+        
+        # Check which records match an ISIN in our DB (payout ISIN takes precedence)
+        payout_mask = nav_all_df['ISIN Payout'].isin(db_isins)
+        reinv_mask = nav_all_df['ISIN Reinv'].isin(db_isins)
+        nav_all_df['ISIN'] = np.where(payout_mask, nav_all_df['ISIN Payout'], nav_all_df['ISIN Reinv'])
+        df = nav_all_df.loc[payout_mask | reinv_mask, ['ISIN', 'Scheme Code', 'Scheme Name']]
                     
     except Exception as e:
         logger.error(f"Error parsing NAVAll.txt: {e}")
         return False
 
     # 3. Write to CSV
-    if matched_data:
-        df = pd.DataFrame(matched_data)
+    if not df.empty:
         # Sort by Scheme Name for better readability
         df = df.sort_values('Scheme Name')
         
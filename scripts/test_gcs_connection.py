@@ -1,8 +1,11 @@
 import os
 import sys
-from google.cloud import storage
 from google.api_core.exceptions import Forbidden, NotFound
 
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.utils.gcs_client import get_client
+
 def test_gcs_connection():
     bucket_name = os.getenv('GCS_BUCKET_NAME', 'nav-timeseries-data')
     use_gcs = os.getenv('USE_GCS', 'False').lower() == 'true'
@@ -23,18 +26,22 @@ def test_gcs_connection():
 
     try:
         print(f"Attempting to connect to GCS bucket '{bucket_name}'...")
-        client = storage.Client()
-        bucket = client.bucket(bucket_name)
+        client = get_client()
         
-        # Check if bucket exists and we have access
-        if not bucket.exists():
-            print(f"ERROR: Bucket '{bucket_name}' does not exist or you don't have permission to view it.")
+        # Check if bucket exists and we have access (a single metadata request)
+        try:
+            bucket = client.get_bucket(bucket_name)
+        except NotFound:
+            print(f"ERROR: Bucket '{bucket_name}' does not exist.")
+            return False
+        except Forbidden:
+            print(f"ERROR: You don't have permission to view bucket '{bucket_name}'.")
             return False
             
-        print("SUCCESS: Connected to bucket!")
+        print(f"SUCCESS: Connected to bucket! (location: {bucket.location})")
         
-        # Try listing blobs (to verify permissions)
-        blobs = list(bucket.list_blobs(max_results=5))
+        # Try listing blobs (to verify permissions); only names are requested to keep the response small
+        blobs = list(client.list_blobs(bucket_name, max_results=5, fields='items(name),nextPageToken'))
         print(f"Successfully listed {len(blobs)} files (sample).")
         
         print("\nReady to go! Your GCS setup looks correct.")
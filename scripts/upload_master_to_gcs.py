@@ -1,15 +1,64 @@
 import os
 import sys
 from dotenv import load_dotenv
-from google.cloud import storage
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app import config
+from app.utils.gcs_client import get_bucket
 
 # Load env vars
 load_dotenv()
 
+# Local data directory, laid out the same as the bucket (see app.config)
+LOCAL_DATA_DIR = os.path.join(config.BASE_DIR, "data")
+
+# Files above this size are split and uploaded as concurrent chunks
+LARGE_FILE_THRESHOLD = 100 * 1024 * 1024
+
+def upload_files(filenames, bucket_name=None, source_directory=LOCAL_DATA_DIR, max_workers=16):
+    """
+    Uploads many local files in parallel. Blob names are the filenames relative
+    to source_directory, e.g. historical_nav/100119.csv.
+    Files above LARGE_FILE_THRESHOLD are uploaded as concurrent chunks instead.
+    
+    Returns:
+        dict: {filename: exception} for the uploads that failed
+    """
+    from google.cloud.storage import transfer_manager
+
+    bucket = get_bucket(bucket_name)
+    failures = {}
+
+    small_files, large_files = [], []
+    for filename in filenames:
+        if os.path.getsize(os.path.join(source_directory, filename)) > LARGE_FILE_THRESHOLD:
+            large_files.append(filename)
+        else:
+            small_files.append(filename)
+
+    if small_files:
+        results = transfer_manager.upload_many_from_filenames(
+            bucket,
+            small_files,
+            source_directory=source_directory,
+            max_workers=max_workers
+        )
+        failures.update({f: r for f, r in zip(small_files, results) if isinstance(r, Exception)})
+
+    for filename in large_files:
+        try:
+            transfer_manager.upload_chunks_concurrently(
+                os.path.join(source_directory, filename),
+                bucket.blob(filename),
+                chunk_size=32 * 1024 * 1024,
+                max_workers=8
+            )
+        except Exception as e:
+            failures[filename] = e
+
+    return failures
+
 def upload_master_list():
     """
     For Option B (Fresh Start), we still need the master list in the bucket
@@ -30,11 +79,15 @@ def upload_master_list():
     print(f"Uploading master list to bucket '{bucket_name}'...")
     
     try:
-        client = storage.Client()
-        bucket = client.bucket(bucket_name)
-        blob = bucket.blob("isin_master_list.csv")
+        from google.cloud.storage.retry import DEFAULT_RETRY
+
+        bucket = get_bucket(bucket_name)
+        blob = bucket.blob("isin_master_list.csv", chunk_size=None)
         
-        blob.upload_from_filename(local_path)
+        # With no chunk size and a known size this is one multipart request, no resumable session.
+        # Re-uploading the same file is idempotent, so it is safe to always retry.
+        with open(local_path, 'rb') as f:
+            blob.upload_from_file(f, size=os.path.getsize(local_path), content_type='text/csv', retry=DEFAULT_RETRY)
         print("Success! Master list uploaded.")
         print("You can now run ./scripts/historical_setup.sh to populate the rest.")
         